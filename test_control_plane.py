@@ -5,16 +5,76 @@ Tests all endpoints: upload, consumer, and health checks
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import argparse
+import asyncio
+import contextvars
+import functools
+import inspect
+import io
 import json
 import os
 import sys
+import tempfile
+import threading
 import time
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import aiohttp
+except ImportError:  # only needed for --async
+    aiohttp = None
+
+try:
+    import httpx
+except ImportError:  # only needed for --httpx
+    httpx = None
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # stdlib json accepts bytes too, just slower
+    json_loads = json.loads
+
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:  # fall back to requests' own multipart encoding
+    MultipartEncoder = None
 
 # Configuration
 UPLOAD_URL = "http://localhost:8080"
 CONSUMER_URL = "http://localhost:8081"
 
+# Set TEST_VERBOSE=0 to skip formatting and printing of informational detail lines
+VERBOSE = os.environ.get("TEST_VERBOSE", "1") == "1"
+
+# Set TEST_STAGE_UPLOADS=1 to upload from a real (anonymous) temp file instead of memory
+STAGE_UPLOADS = os.environ.get("TEST_STAGE_UPLOADS", "0") == "1"
+
+# Test fixtures
+TEST_FILENAME = "test-config"
+TEST_CONTENT_V1 = "Hello, World! This is version 1.0.0\n"
+TEST_CONTENT_V2 = "Hello, World! This is version 2.0.0\nUpdated content here.\n"
+# Encoded once so downloaded bodies can be compared without decoding them
+TEST_CONTENT_V1_BYTES = TEST_CONTENT_V1.encode('utf-8')
+TEST_CONTENT_V2_BYTES = TEST_CONTENT_V2.encode('utf-8')
+
+
+def make_session(base_url):
+    """Create a keep-alive session with a bounded connection pool for base_url"""
+    session = requests.Session()
+    session.mount(base_url, HTTPAdapter(pool_connections=2, pool_maxsize=16, max_retries=0))
+    return session
+
+
+# Shared sessions so sequential requests reuse pooled connections
+SESSION_UPLOAD = make_session(UPLOAD_URL)
+SESSION_CONSUMER = make_session(CONSUMER_URL)
+
+# Health checks are fixed-shape requests issued repeatedly, so prepare them once
+HEALTH_UPLOAD_REQ = SESSION_UPLOAD.prepare_request(requests.Request('GET', f"{UPLOAD_URL}/health"))
+HEALTH_CONSUMER_REQ = SESSION_CONSUMER.prepare_request(requests.Request('GET', f"{CONSUMER_URL}/health"))
+
 # Test colors
 GREEN = "\033[92m"
 RED = "\033[91m"
@@ -23,276 +83,777 @@ BLUE = "\033[94m"
 RESET = "\033[0m"
 
 
+# Fixed prefixes/suffixes so each line is a single concatenation and write
+_TEST_PREFIX = f"\n{BLUE}Testing: "
+_SUCCESS_PREFIX = f"{GREEN}✓ "
+_ERROR_PREFIX = f"{RED}✗ "
+_INFO_PREFIX = f"{YELLOW}  "
+_RESET_NL = f"{RESET}\n"
+
+# Lines captured for the test running in the current thread/task, or None to write directly
+_OUTPUT = contextvars.ContextVar("output", default=None)
+
+
+def write_line(line):
+    """Write an output line, or buffer it while a concurrent test is being captured"""
+    buffer = _OUTPUT.get()
+    if buffer is None:
+        sys.stdout.write(line)
+    else:
+        buffer.append(line)
+
+
+def captured(fn, *args):
+    """Call fn(*args), returning (result, output) with everything it printed"""
+    buffer = []
+    token = _OUTPUT.set(buffer)
+    try:
+        return fn(*args), "".join(buffer)
+    finally:
+        _OUTPUT.reset(token)
+
+
 def print_test(name):
     """Print test name"""
-    print(f"\n{BLUE}Testing: {name}{RESET}")
+    write_line(_TEST_PREFIX + name + _RESET_NL)
 
 
 def print_success(message):
     """Print success message"""
-    print(f"{GREEN}✓ {message}{RESET}")
+    write_line(_SUCCESS_PREFIX + message + _RESET_NL)
 
 
 def print_error(message):
     """Print error message"""
-    print(f"{RED}✗ {message}{RESET}")
+    write_line(_ERROR_PREFIX + message + _RESET_NL)
 
 
 def print_info(message):
-    """Print info message"""
-    print(f"{YELLOW}  {message}{RESET}")
+    """Print info message (only when VERBOSE)"""
+    if VERBOSE:
+        write_line(_INFO_PREFIX + message + _RESET_NL)
 
 
-def test_health_checks():
-    """Test health check endpoints"""
-    print_test("Health Checks")
-    
-    # Test upload server health
-    try:
-        response = requests.get(f"{UPLOAD_URL}/health", timeout=5)
-        if response.status_code == 200:
-            print_success(f"Upload server health check: {response.json()}")
+class FailFast:
+    """Trips after a run of consecutive request exceptions so later tests are skipped"""
+
+    def __init__(self, threshold=2):
+        self.threshold = threshold
+        self.consecutive_errors = 0
+        self.lock = threading.Lock()
+
+    @property
+    def aborted(self):
+        return self.consecutive_errors >= self.threshold
+
+    def record_error(self):
+        with self.lock:
+            self.consecutive_errors += 1
+
+    def record_success(self):
+        with self.lock:
+            if not self.aborted:
+                self.consecutive_errors = 0
+
+
+FAIL_FAST = FailFast()
+
+# Only transport failures count towards FAIL_FAST; bad responses are ordinary test failures
+NETWORK_ERRORS = (requests.RequestException,)
+if aiohttp is not None:
+    NETWORK_ERRORS += (aiohttp.ClientError, asyncio.TimeoutError)
+if httpx is not None:
+    NETWORK_ERRORS += (httpx.TransportError,)
+
+
+@functools.lru_cache(maxsize=256)
+def short(checksum):
+    """Truncate a checksum for display; the same few repeat across upload/info/get output"""
+    return checksum[:16] if checksum else 'N/A'
+
+
+def http_test(name, failure=(False, None), heading=True):
+    """Decorate a sync or async test to print its heading and turn exceptions into failure
+
+    name is a str.format template filled from the test's arguments; with
+    heading=False it only labels error messages (for checks grouped under a
+    caller's heading). Network errors count towards FAIL_FAST; once it has
+    tripped, the test is skipped and reported as failed.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        
+        def start(args, kwargs):
+            title = name.format(**signature.bind(*args, **kwargs).arguments)
+            if heading:
+                print_test(title)
+            return title
+        
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                title = start(args, kwargs)
+                if FAIL_FAST.aborted:
+                    print_error(f"{title} skipped after repeated network errors")
+                    return failure
+                try:
+                    result = await fn(*args, **kwargs)
+                except NETWORK_ERRORS as e:
+                    FAIL_FAST.record_error()
+                    print_error(f"{title} exception: {e}")
+                    return failure
+                except Exception as e:
+                    print_error(f"{title} exception: {e}")
+                    return failure
+                FAIL_FAST.record_success()
+                return result
         else:
-            print_error(f"Upload server health check failed: {response.status_code}")
-            return False
-    except Exception as e:
-        print_error(f"Upload server health check failed: {e}")
-        return False
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                title = start(args, kwargs)
+                if FAIL_FAST.aborted:
+                    print_error(f"{title} skipped after repeated network errors")
+                    return failure
+                try:
+                    result = fn(*args, **kwargs)
+                except NETWORK_ERRORS as e:
+                    FAIL_FAST.record_error()
+                    print_error(f"{title} exception: {e}")
+                    return failure
+                except Exception as e:
+                    print_error(f"{title} exception: {e}")
+                    return failure
+                FAIL_FAST.record_success()
+                return result
+        return wrapper
+    return decorator
+
+
+def run_parallel(callables, max_workers=8):
+    """Run independent (name, thunk) pairs concurrently, returning (name, result) in order
+
+    Each thunk's output is captured and written as one block in submission
+    order, so results always appear under their own test heading.
+    """
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(name, executor.submit(captured, thunk)) for name, thunk in callables]
+        for name, future in futures:
+            result, output = future.result()
+            write_line(output)
+            results.append((name, result))
+    sys.stdout.flush()
+    return results
+
+
+async def gather_ordered(*reads):
+    """Await coroutines concurrently, returning results in order (async run_parallel)
+
+    Each coroutine runs in its own task with its output captured, and the
+    blocks are written in argument order.
+    """
+    async def capture(read):
+        # Tasks run in a copy of the context, so this buffer is private to the task
+        buffer = []
+        _OUTPUT.set(buffer)
+        return await read, "".join(buffer)
     
-    # Test consumer server health
-    try:
-        response = requests.get(f"{CONSUMER_URL}/health", timeout=5)
-        if response.status_code == 200:
-            print_success(f"Consumer server health check: {response.json()}")
+    tasks = [asyncio.create_task(capture(read)) for read in reads]
+    results = []
+    for task in tasks:
+        result, output = await task
+        write_line(output)
+        results.append(result)
+    sys.stdout.flush()
+    return results
+
+
+class BufferedResponse:
+    """Fully read HTTP response exposing the subset of requests.Response used by the checks"""
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json_loads(self.content)
+
+
+async def read_response(response):
+    """Buffer an aiohttp response so the shared check_* functions can inspect it"""
+    return BufferedResponse(response.status, response.headers, await response.read())
+
+
+def check_health(label, response):
+    """Check a single server's health endpoint response"""
+    if response.status_code == 200:
+        # Only the status matters here, so show the raw body rather than parsing it
+        body = response.content[:80].rstrip().decode('utf-8', errors='replace')
+        print_success(f"{label} health check: {body}")
+        return True
+    else:
+        print_error(f"{label} health check failed: {response.status_code}")
+        print_info(f"  Response: {response.text}")
+        return False
+
+
+def check_file_upload(response):
+    """Check an upload response, returning (success, metadata)"""
+    if response.status_code == 200:
+        result = json_loads(response.content)
+        if result.get('success'):
+            metadata = result.get('metadata', {})
+            print_success(f"File uploaded successfully")
+            if VERBOSE:
+                print_info(f"  Checksum: {short(metadata.get('checksum'))}...")
+                print_info(f"  Size: {metadata.get('size', 'N/A')} bytes")
+                print_info(f"  Path: {metadata.get('filepath', 'N/A')}")
+            return True, metadata
         else:
-            print_error(f"Consumer server health check failed: {response.status_code}")
-            return False
-    except Exception as e:
-        print_error(f"Consumer server health check failed: {e}")
+            print_error(f"Upload failed: {result.get('message', 'Unknown error')}")
+            return False, None
+    else:
+        print_error(f"Upload failed with status {response.status_code}")
+        print_info(f"  Response: {response.text}")
+        return False, None
+
+
+def check_latest_file(filename, response):
+    """Check a latest-version response, returning (success, content)"""
+    if response.status_code == 200:
+        print_success(f"Retrieved latest version of {filename}")
+        if VERBOSE:
+            print_info(f"  Content length: {len(response.content)} bytes")
+            print_info(f"  Version header: {response.headers.get('X-File-Version', 'N/A')}")
+            print_info(f"  Checksum header: {short(response.headers.get('X-File-Checksum'))}...")
+        return True, response.content
+    else:
+        print_error(f"Failed to retrieve file: {response.status_code}")
+        print_info(f"  Response: {response.text}")
+        return False, None
+
+
+def check_file_version(filename, version, response):
+    """Check a specific-version response, returning (success, content)"""
+    if response.status_code == 200:
+        print_success(f"Retrieved {filename} version {version}")
+        if VERBOSE:
+            print_info(f"  Content length: {len(response.content)} bytes")
+            print_info(f"  Version header: {response.headers.get('X-File-Version', 'N/A')}")
+        return True, response.content
+    else:
+        print_error(f"Failed to retrieve file version: {response.status_code}")
+        print_info(f"  Response: {response.text}")
+        return False, None
+
+
+def check_file_info(filename, response):
+    """Check a file info response, returning (success, info)"""
+    if response.status_code == 200:
+        info = json_loads(response.content)
+        print_success(f"Retrieved file info for {filename}")
+        if VERBOSE:
+            print_info(f"  Filename: {info.get('filename', 'N/A')}")
+            print_info(f"  Version: {info.get('version', 'N/A')}")
+            print_info(f"  Checksum: {short(info.get('checksum'))}...")
+            print_info(f"  Size: {info.get('size', 'N/A')} bytes")
+            print_info(f"  Uploaded: {info.get('uploaded_at', 'N/A')}")
+        return True, info
+    else:
+        print_error(f"Failed to retrieve file info: {response.status_code}")
+        print_info(f"  Response: {response.text}")
+        return False, None
+
+
+def check_nonexistent_file(response):
+    """Check that a nonexistent file returns 404"""
+    if response.status_code == 404:
+        print_success("Correctly returned 404 for nonexistent file")
+        return True
+    else:
+        print_error(f"Expected 404, got {response.status_code}")
         return False
+
+
+def health_requests(httpx_client=None):
+    """Return (label, send) pairs, where send(timeout) issues that server's health request"""
+    if httpx_client is not None:
+        # A bare number would replace the whole client Timeout, so keep its connect limit
+        return [
+            ("Upload server", lambda timeout: httpx_client.get(
+                f"{UPLOAD_URL}/health", timeout=httpx.Timeout(timeout, connect=HTTPX_CONNECT_TIMEOUT))),
+            ("Consumer server", lambda timeout: httpx_client.get(
+                f"{CONSUMER_URL}/health", timeout=httpx.Timeout(timeout, connect=HTTPX_CONNECT_TIMEOUT))),
+        ]
+    return [
+        ("Upload server", lambda timeout: SESSION_UPLOAD.send(HEALTH_UPLOAD_REQ, timeout=timeout)),
+        ("Consumer server", lambda timeout: SESSION_CONSUMER.send(HEALTH_CONSUMER_REQ, timeout=timeout)),
+    ]
+
+
+@http_test("{label} health check", failure=False, heading=False)
+def test_server_health(label, send):
+    """Test a single server's health endpoint"""
+    response = send(5)
+    return check_health(label, response)
+
+
+def test_health_checks(requests_by_server):
+    """Test health check endpoints"""
+    print_test("Health Checks")
     
-    return True
+    results = run_parallel([
+        (label, functools.partial(test_server_health, label, send))
+        for label, send in requests_by_server
+    ])
+    return all(result for _, result in results)
+
 
+def upload_body(content):
+    """Return a readable file object holding content for a multipart upload"""
+    data = content.encode('utf-8')
+    if not STAGE_UPLOADS:
+        return io.BytesIO(data)
+    # Anonymous temp file (O_TMPFILE on Linux): no directory entry to create or unlink
+    staged = tempfile.TemporaryFile()
+    staged.write(data)
+    staged.seek(0)
+    return staged
 
+
+@http_test("File Upload: {filename} v{version}")
 def test_file_upload(filename, version, content):
     """Test file upload"""
-    print_test(f"File Upload: {filename} v{version}")
-    
-    # Create a temporary file
-    test_file = Path(f"/tmp/test_{filename}_{version}.txt")
-    test_file.write_text(content)
-    
-    try:
-        with open(test_file, 'rb') as f:
-            files = {'file': (filename, f, 'text/plain')}
+    with upload_body(content) as body:
+        if MultipartEncoder is not None:
+            # Stream the multipart body instead of letting requests build it in memory
+            encoder = MultipartEncoder(fields={
+                'filename': filename,
+                'version': version,
+                'file': (filename, body, 'text/plain')
+            })
+            response = SESSION_UPLOAD.post(
+                f"{UPLOAD_URL}/upload",
+                data=encoder,
+                headers={'Content-Type': encoder.content_type},
+                timeout=10
+            )
+        else:
+            files = {'file': (filename, body, 'text/plain')}
             data = {
                 'filename': filename,
                 'version': version
             }
-            response = requests.post(
+            response = SESSION_UPLOAD.post(
                 f"{UPLOAD_URL}/upload",
                 files=files,
                 data=data,
                 timeout=10
             )
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result.get('success'):
-                metadata = result.get('metadata', {})
-                print_success(f"File uploaded successfully")
-                print_info(f"  Checksum: {metadata.get('checksum', 'N/A')[:16]}...")
-                print_info(f"  Size: {metadata.get('size', 'N/A')} bytes")
-                print_info(f"  Path: {metadata.get('filepath', 'N/A')}")
-                return True, metadata
-            else:
-                print_error(f"Upload failed: {result.get('message', 'Unknown error')}")
-                return False, None
-        else:
-            print_error(f"Upload failed with status {response.status_code}")
-            print_info(f"  Response: {response.text}")
-            return False, None
-    except Exception as e:
-        print_error(f"Upload exception: {e}")
-        return False, None
-    finally:
-        # Clean up temp file
-        if test_file.exists():
-            test_file.unlink()
+    return check_file_upload(response)
 
 
+@http_test("Get Latest File: {filename}")
 def test_get_latest_file(filename):
     """Test getting latest version of a file"""
-    print_test(f"Get Latest File: {filename}")
-    
-    try:
-        response = requests.get(f"{CONSUMER_URL}/file/{filename}", timeout=10)
-        
-        if response.status_code == 200:
-            print_success(f"Retrieved latest version of {filename}")
-            print_info(f"  Content length: {len(response.content)} bytes")
-            print_info(f"  Version header: {response.headers.get('X-File-Version', 'N/A')}")
-            print_info(f"  Checksum header: {response.headers.get('X-File-Checksum', 'N/A')[:16]}...")
-            return True, response.content
-        else:
-            print_error(f"Failed to retrieve file: {response.status_code}")
-            print_info(f"  Response: {response.text}")
-            return False, None
-    except Exception as e:
-        print_error(f"Get file exception: {e}")
-        return False, None
+    response = SESSION_CONSUMER.get(f"{CONSUMER_URL}/file/{filename}", timeout=10)
+    return check_latest_file(filename, response)
 
 
+@http_test("Get File Version: {filename} v{version}")
 def test_get_file_version(filename, version):
     """Test getting specific version of a file"""
-    print_test(f"Get File Version: {filename} v{version}")
-    
-    try:
-        response = requests.get(f"{CONSUMER_URL}/file/{filename}/version/{version}", timeout=10)
-        
-        if response.status_code == 200:
-            print_success(f"Retrieved {filename} version {version}")
-            print_info(f"  Content length: {len(response.content)} bytes")
-            print_info(f"  Version header: {response.headers.get('X-File-Version', 'N/A')}")
-            return True, response.content
-        else:
-            print_error(f"Failed to retrieve file version: {response.status_code}")
-            print_info(f"  Response: {response.text}")
-            return False, None
-    except Exception as e:
-        print_error(f"Get file version exception: {e}")
-        return False, None
+    response = SESSION_CONSUMER.get(f"{CONSUMER_URL}/file/{filename}/version/{version}", timeout=10)
+    return check_file_version(filename, version, response)
 
 
+@http_test("Get File Info: {filename}")
 def test_get_file_info(filename):
     """Test getting file metadata"""
-    print_test(f"Get File Info: {filename}")
-    
-    try:
-        response = requests.get(f"{CONSUMER_URL}/file/{filename}/info", timeout=10)
-        
-        if response.status_code == 200:
-            info = response.json()
-            print_success(f"Retrieved file info for {filename}")
-            print_info(f"  Filename: {info.get('filename', 'N/A')}")
-            print_info(f"  Version: {info.get('version', 'N/A')}")
-            print_info(f"  Checksum: {info.get('checksum', 'N/A')[:16]}...")
-            print_info(f"  Size: {info.get('size', 'N/A')} bytes")
-            print_info(f"  Uploaded: {info.get('uploaded_at', 'N/A')}")
-            return True, info
-        else:
-            print_error(f"Failed to retrieve file info: {response.status_code}")
-            print_info(f"  Response: {response.text}")
-            return False, None
-    except Exception as e:
-        print_error(f"Get file info exception: {e}")
-        return False, None
+    response = SESSION_CONSUMER.get(f"{CONSUMER_URL}/file/{filename}/info", timeout=10)
+    return check_file_info(filename, response)
 
 
+@http_test("Nonexistent File Handling", failure=False)
 def test_nonexistent_file():
     """Test handling of nonexistent file"""
-    print_test("Nonexistent File Handling")
+    response = SESSION_CONSUMER.get(f"{CONSUMER_URL}/file/nonexistent_file_12345", timeout=5)
+    return check_nonexistent_file(response)
+
+
+@http_test("{label} health check", failure=False, heading=False)
+async def test_server_health_async(label, session, url):
+    """Test a single server's health endpoint (async)"""
+    async with session.get(f"{url}/health", timeout=aiohttp.ClientTimeout(total=5)) as response:
+        return check_health(label, await read_response(response))
+
+
+async def test_health_checks_async(session):
+    """Test health check endpoints (async)"""
+    print_test("Health Checks")
     
-    try:
-        response = requests.get(f"{CONSUMER_URL}/file/nonexistent_file_12345", timeout=5)
-        
-        if response.status_code == 404:
-            print_success("Correctly returned 404 for nonexistent file")
-            return True
-        else:
-            print_error(f"Expected 404, got {response.status_code}")
+    results = await gather_ordered(
+        test_server_health_async("Upload server", session, UPLOAD_URL),
+        test_server_health_async("Consumer server", session, CONSUMER_URL),
+    )
+    return all(results)
+
+
+@http_test("File Upload: {filename} v{version}")
+async def test_file_upload_async(session, filename, version, content):
+    """Test file upload (async)"""
+    form = aiohttp.FormData()
+    form.add_field('filename', filename)
+    form.add_field('version', version)
+    form.add_field('file', content.encode('utf-8'), filename=filename, content_type='text/plain')
+    
+    async with session.post(f"{UPLOAD_URL}/upload", data=form, timeout=aiohttp.ClientTimeout(total=10)) as response:
+        return check_file_upload(await read_response(response))
+
+
+@http_test("Get Latest File: {filename}")
+async def test_get_latest_file_async(session, filename):
+    """Test getting latest version of a file (async)"""
+    async with session.get(f"{CONSUMER_URL}/file/{filename}", timeout=aiohttp.ClientTimeout(total=10)) as response:
+        return check_latest_file(filename, await read_response(response))
+
+
+@http_test("Get File Version: {filename} v{version}")
+async def test_get_file_version_async(session, filename, version):
+    """Test getting specific version of a file (async)"""
+    async with session.get(f"{CONSUMER_URL}/file/{filename}/version/{version}", timeout=aiohttp.ClientTimeout(total=10)) as response:
+        return check_file_version(filename, version, await read_response(response))
+
+
+@http_test("Get File Info: {filename}")
+async def test_get_file_info_async(session, filename):
+    """Test getting file metadata (async)"""
+    async with session.get(f"{CONSUMER_URL}/file/{filename}/info", timeout=aiohttp.ClientTimeout(total=10)) as response:
+        return check_file_info(filename, await read_response(response))
+
+
+@http_test("Nonexistent File Handling", failure=False)
+async def test_nonexistent_file_async(session):
+    """Test handling of nonexistent file (async)"""
+    async with session.get(f"{CONSUMER_URL}/file/nonexistent_file_12345", timeout=aiohttp.ClientTimeout(total=5)) as response:
+        return check_nonexistent_file(await read_response(response))
+
+
+def wait_for_version(filename, version, deadline=2.0, interval=0.02):
+    """Poll the info endpoint until it reports version, returning False on timeout
+
+    Polling errors are expected while a server settles, so at most one
+    error is recorded with FAIL_FAST: when the last attempt before giving
+    up failed at the network level.
+    """
+    if FAIL_FAST.aborted:
+        return False
+    give_up = time.monotonic() + deadline
+    while True:
+        network_error = False
+        try:
+            response = SESSION_CONSUMER.get(f"{CONSUMER_URL}/file/{filename}/info", timeout=interval + 1)
+            FAIL_FAST.record_success()
+            if response.status_code == 200 and json_loads(response.content).get('version') == version:
+                return True
+        except NETWORK_ERRORS:
+            network_error = True
+        except ValueError:
+            pass
+        if time.monotonic() >= give_up:
+            if network_error:
+                FAIL_FAST.record_error()
+            print_info(f"  {filename} v{version} not visible after {deadline}s, continuing")
             return False
-    except Exception as e:
-        print_error(f"Exception: {e}")
+        time.sleep(interval)
+
+
+async def wait_for_version_async(session, filename, version, deadline=2.0, interval=0.02):
+    """Poll the info endpoint until it reports version, returning False on timeout (async)
+
+    Records at most one FAIL_FAST error per call, like wait_for_version.
+    """
+    if FAIL_FAST.aborted:
         return False
+    give_up = time.monotonic() + deadline
+    while True:
+        network_error = False
+        try:
+            async with session.get(f"{CONSUMER_URL}/file/{filename}/info",
+                                   timeout=aiohttp.ClientTimeout(total=interval + 1)) as response:
+                FAIL_FAST.record_success()
+                if response.status == 200 and (await read_response(response)).json().get('version') == version:
+                    return True
+        except NETWORK_ERRORS:
+            network_error = True
+        except ValueError:
+            pass
+        if time.monotonic() >= give_up:
+            if network_error:
+                FAIL_FAST.record_error()
+            print_info(f"  {filename} v{version} not visible after {deadline}s, continuing")
+            return False
+        await asyncio.sleep(interval)
+
+
+def verify_content(content, expected, ok_message, error_message):
+    """Compare a downloaded body against the uploaded bytes"""
+    if content == expected:
+        print_success(ok_message)
+    else:
+        print_error(error_message)
+        print_info(f"  Expected: {expected.decode('utf-8')[:50]}...")
+        print_info(f"  Got: {content.decode('utf-8', errors='replace')[:50]}...")
+
+
+def expect_content(result, expected, ok_message, error_message):
+    """Verify a (success, content) read against expected bytes, passing the result through"""
+    success, content = result
+    if success and content:
+        verify_content(content, expected, ok_message, error_message)
+    return result
+
+
+async def expect_content_async(read, *expectation):
+    """Await a read coroutine and verify its content (async)"""
+    return expect_content(await read, *expectation)
+
 
+# (expected bytes, success message, mismatch message) for reads whose body is verified
+V1_LATEST_CONTENT = (TEST_CONTENT_V1_BYTES, "Content matches uploaded file", "Content mismatch!")
+V2_LATEST_CONTENT = (TEST_CONTENT_V2_BYTES,
+                     "Latest version correctly returns v2.0.0", "Latest version content mismatch!")
+V1_VERSION_CONTENT = (TEST_CONTENT_V1_BYTES,
+                      "Specific version content matches", "Specific version content mismatch!")
 
-def main():
-    """Run all tests"""
+
+def record_v1_reads(results, reads):
+    """Record the info/latest reads made after uploading v1.0.0"""
+    # Test 3: Get file info
+    success, _ = reads["info"]
+    results.append(("Get File Info", success))
+    
+    # Test 4: Get latest file
+    success, _ = reads["latest"]
+    results.append(("Get Latest File", success))
+
+
+def record_v2_reads(results, reads):
+    """Record the info/latest/version reads made after uploading v2.0.0"""
+    # Test 6: File info should report v2.0.0
+    success, info = reads["info"]
+    results.append(("Get File Info (should be v2.0.0)", success and info.get('version') == "2.0.0"))
+    
+    # Test 7: Get latest should return v2.0.0
+    success, _ = reads["latest"]
+    results.append(("Get Latest File (should be v2.0.0)", success))
+    
+    # Test 8: Get specific version v1.0.0
+    success, _ = reads["v1"]
+    results.append(("Get Specific Version v1.0.0", success))
+    
+    # Test 9: Get specific version v2.0.0
+    success, _ = reads["v2"]
+    results.append(("Get Specific Version v2.0.0", success))
+
+
+def print_banner():
+    """Print suite banner"""
     print(f"\n{BLUE}{'='*60}")
     print("Cloudflare Control Plane Test Suite")
     print(f"{'='*60}{RESET}\n")
+
+
+def abort_unreachable(error):
+    """Report unreachable servers and exit"""
+    print_error(f"Servers not reachable: {error}")
+    print_info("Make sure docker compose is running: docker compose up -d")
+    sys.exit(1)
+
+
+def abort_without_upload(results):
+    """Report that the suite cannot continue without the first upload and exit"""
+    print_error("Cannot continue tests without successful upload")
+    print_summary(results)
+    sys.exit(1)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Cloudflare Control Plane test suite")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="issue requests concurrently with asyncio + aiohttp instead of requests + threads",
+    )
+    mode.add_argument(
+        "--httpx", dest="use_httpx", action="store_true",
+        help="send the health checks through an HTTP/2-capable httpx client",
+    )
+    return parser.parse_args(argv)
+
+
+# Connect timeout for the --httpx health checks, kept separate from the per-call total
+HTTPX_CONNECT_TIMEOUT = 2.0
+
+
+def make_httpx_client():
+    """Create the httpx client used for health checks with --httpx"""
+    if httpx is None:
+        print_error("The --httpx mode requires httpx: pip install 'httpx[http2]'")
+        sys.exit(1)
+    try:
+        return httpx.Client(
+            http2=True,
+            timeout=httpx.Timeout(5.0, connect=HTTPX_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+        )
+    except ImportError:
+        print_error("The --httpx mode requires HTTP/2 support: pip install 'httpx[http2]'")
+        sys.exit(1)
+
+
+def main(argv=None):
+    """Run all tests, releasing pooled connections afterwards"""
+    args = parse_args(argv)
+    httpx_client = make_httpx_client() if args.use_httpx else None
+    try:
+        if args.use_async:
+            asyncio.run(run_tests_async())
+        else:
+            run_tests(httpx_client)
+    finally:
+        SESSION_UPLOAD.close()
+        SESSION_CONSUMER.close()
+        if httpx_client is not None:
+            httpx_client.close()
+
+
+def run_tests(httpx_client=None):
+    """Run all tests, sending health checks through httpx_client when given"""
+    print_banner()
+    health = health_requests(httpx_client)
     
     # Check if servers are reachable
     print_test("Server Connectivity")
     try:
-        requests.get(f"{UPLOAD_URL}/health", timeout=2)
-        requests.get(f"{CONSUMER_URL}/health", timeout=2)
+        for _, send in health:
+            send(2)
         print_success("Both servers are reachable")
     except Exception as e:
-        print_error(f"Servers not reachable: {e}")
-        print_info("Make sure docker compose is running: docker compose up -d")
-        sys.exit(1)
+        abort_unreachable(e)
     
     results = []
     
     # Test 1: Health checks
-    results.append(("Health Checks", test_health_checks()))
+    results.append(("Health Checks", test_health_checks(health)))
     
     # Test 2: Upload a file
-    test_content_v1 = "Hello, World! This is version 1.0.0\n"
-    success, metadata_v1 = test_file_upload("test-config", "1.0.0", test_content_v1)
+    success, metadata_v1 = test_file_upload(TEST_FILENAME, "1.0.0", TEST_CONTENT_V1)
     results.append(("File Upload v1.0.0", success))
     
     if not success:
-        print_error("Cannot continue tests without successful upload")
-        print_summary(results)
-        sys.exit(1)
-    
-    # Wait a bit for Redis to sync
-    time.sleep(0.5)
-    
-    # Test 3: Get file info
-    success, info = test_get_file_info("test-config")
-    results.append(("Get File Info", success))
+        abort_without_upload(results)
     
-    # Test 4: Get latest file
-    success, content = test_get_latest_file("test-config")
-    results.append(("Get Latest File", success))
+    # Wait for the new version to be visible before reading it back
+    wait_for_version(TEST_FILENAME, "1.0.0")
     
-    if success and content:
-        # Verify content matches
-        if content.decode('utf-8') == test_content_v1:
-            print_success("Content matches uploaded file")
-        else:
-            print_error("Content mismatch!")
-            print_info(f"  Expected: {test_content_v1[:50]}...")
-            print_info(f"  Got: {content.decode('utf-8')[:50]}...")
+    # Tests 3-4: Get file info and latest file (independent reads)
+    reads = dict(run_parallel([
+        ("info", lambda: test_get_file_info(TEST_FILENAME)),
+        ("latest", lambda: expect_content(test_get_latest_file(TEST_FILENAME), *V1_LATEST_CONTENT)),
+    ]))
+    record_v1_reads(results, reads)
     
     # Test 5: Upload a new version
-    test_content_v2 = "Hello, World! This is version 2.0.0\nUpdated content here.\n"
-    success, metadata_v2 = test_file_upload("test-config", "2.0.0", test_content_v2)
+    success, metadata_v2 = test_file_upload(TEST_FILENAME, "2.0.0", TEST_CONTENT_V2)
     results.append(("File Upload v2.0.0", success))
     
     if success:
-        time.sleep(0.5)
+        wait_for_version(TEST_FILENAME, "2.0.0")
         
-        # Test 6: Get latest should return v2.0.0
-        success, content = test_get_latest_file("test-config")
-        results.append(("Get Latest File (should be v2.0.0)", success))
+        # Tests 6-9: Reads against both versions are independent of each other
+        reads = dict(run_parallel([
+            ("info", lambda: test_get_file_info(TEST_FILENAME)),
+            ("latest", lambda: expect_content(test_get_latest_file(TEST_FILENAME), *V2_LATEST_CONTENT)),
+            ("v1", lambda: expect_content(test_get_file_version(TEST_FILENAME, "1.0.0"), *V1_VERSION_CONTENT)),
+            ("v2", lambda: test_get_file_version(TEST_FILENAME, "2.0.0")),
+        ]))
+        record_v2_reads(results, reads)
+    
+    # Test 10: Nonexistent file
+    results.append(("Nonexistent File Handling", test_nonexistent_file()))
+    
+    # Print summary
+    print_summary(results)
+
+
+async def run_tests_async():
+    """Run all tests on a single event loop with aiohttp"""
+    if aiohttp is None:
+        print_error("The --async mode requires aiohttp: pip install aiohttp")
+        sys.exit(1)
+    
+    print_banner()
+    
+    connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Check if servers are reachable
+        print_test("Server Connectivity")
+        try:
+            for url in (UPLOAD_URL, CONSUMER_URL):
+                async with session.get(f"{url}/health", timeout=aiohttp.ClientTimeout(total=2)) as response:
+                    await response.read()
+            print_success("Both servers are reachable")
+        except Exception as e:
+            abort_unreachable(e)
         
-        if success and content:
-            if content.decode('utf-8') == test_content_v2:
-                print_success("Latest version correctly returns v2.0.0")
-            else:
-                print_error("Latest version content mismatch!")
+        results = []
         
-        # Test 7: Get specific version v1.0.0
-        success, content = test_get_file_version("test-config", "1.0.0")
-        results.append(("Get Specific Version v1.0.0", success))
+        # Test 1: Health checks
+        results.append(("Health Checks", await test_health_checks_async(session)))
         
-        if success and content:
-            if content.decode('utf-8') == test_content_v1:
-                print_success("Specific version content matches")
-            else:
-                print_error("Specific version content mismatch!")
+        # Test 2: Upload a file
+        success, metadata_v1 = await test_file_upload_async(session, TEST_FILENAME, "1.0.0", TEST_CONTENT_V1)
+        results.append(("File Upload v1.0.0", success))
         
-        # Test 8: Get specific version v2.0.0
-        success, content = test_get_file_version("test-config", "2.0.0")
-        results.append(("Get Specific Version v2.0.0", success))
-    
-    # Test 9: Nonexistent file
-    results.append(("Nonexistent File Handling", test_nonexistent_file()))
+        if not success:
+            abort_without_upload(results)
+        
+        # Wait for the new version to be visible before reading it back
+        await wait_for_version_async(session, TEST_FILENAME, "1.0.0")
+        
+        # Tests 3-4: Get file info and latest file (independent reads)
+        info, latest = await gather_ordered(
+            test_get_file_info_async(session, TEST_FILENAME),
+            expect_content_async(test_get_latest_file_async(session, TEST_FILENAME), *V1_LATEST_CONTENT),
+        )
+        record_v1_reads(results, {"info": info, "latest": latest})
+        
+        # Test 5: Upload a new version
+        success, metadata_v2 = await test_file_upload_async(session, TEST_FILENAME, "2.0.0", TEST_CONTENT_V2)
+        results.append(("File Upload v2.0.0", success))
+        
+        if success:
+            await wait_for_version_async(session, TEST_FILENAME, "2.0.0")
+            
+            # Tests 6-9: Reads against both versions are independent of each other
+            info, latest, v1, v2 = await gather_ordered(
+                test_get_file_info_async(session, TEST_FILENAME),
+                expect_content_async(test_get_latest_file_async(session, TEST_FILENAME), *V2_LATEST_CONTENT),
+                expect_content_async(test_get_file_version_async(session, TEST_FILENAME, "1.0.0"),
+                                     *V1_VERSION_CONTENT),
+                test_get_file_version_async(session, TEST_FILENAME, "2.0.0"),
+            )
+            record_v2_reads(results, {"info": info, "latest": latest, "v1": v1, "v2": v2})
+        
+        # Test 10: Nonexistent file
+        results.append(("Nonexistent File Handling", await test_nonexistent_file_async(session)))
     
     # Print summary
     print_summary(results)
@@ -317,7 +878,9 @@ def print_summary(results):
         print(f"{GREEN}All tests passed! ✓{RESET}\n")
     else:
         print(f"{RED}Some tests failed! ✗{RESET}\n")
+        sys.stdout.flush()
         sys.exit(1)
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
@@ -328,6 +891,7 @@ if __name__ == "__main__":
         sys.exit(1)
     except Exception as e:
         print_error(f"Unexpected error: {e}")
+        sys.stdout.flush()
         import traceback
         traceback.print_exc()
         sys.exit(1)